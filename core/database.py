@@ -4,6 +4,106 @@ import datetime
 import asyncpg
 from astrbot.api import logger
 
+# 写入 reminders 表时使用的列（不含自增 id 和 created_at）
+REMINDER_COLUMNS = ['session_id', 'text', 'date_time', 'user_name', 'repeat_type',
+                    'holiday_type', 'creator_id', 'creator_name', 'is_task']
+
+# SQL 语句统一定义为模块常量，保证每次执行的语句文本完全一致，
+# 从而命中 asyncpg 按连接缓存的预处理语句（statement_cache_size 默认 100）
+CREATE_TABLES_SQL = '''
+    CREATE TABLE IF NOT EXISTS reminders (
+        id SERIAL PRIMARY KEY,
+        session_id TEXT NOT NULL,
+        text TEXT NOT NULL,
+        date_time TIMESTAMP NOT NULL,
+        user_name TEXT,
+        repeat_type TEXT,
+        holiday_type TEXT,
+        creator_id TEXT,
+        creator_name TEXT,
+        is_task BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_session_id ON reminders(session_id);
+    CREATE INDEX IF NOT EXISTS idx_creator_id ON reminders(creator_id);
+'''
+
+# 在数据库端按会话聚合为 JSON 数组，每个会话只需解码一次，无需在 Python 中逐行转换
+SELECT_REMINDERS_SQL = '''
+    SELECT session_id,
+           json_agg(json_build_object(
+               'id', id,
+               'text', text,
+               'date_time', to_char(date_time, 'YYYY-MM-DD HH24:MI'),
+               'user_name', user_name,
+               'repeat_type', repeat_type,
+               'holiday_type', holiday_type,
+               'creator_id', creator_id,
+               'creator_name', creator_name,
+               'is_task', is_task
+           ) ORDER BY date_time) AS reminders
+    FROM reminders
+    GROUP BY session_id
+    ORDER BY min(date_time)
+'''
+
+# 保存时先把内存中的全部提醒 COPY 到事务级临时表，再与正式表做差异同步：
+# 只删除已不存在的行、只插入新增的行，未变化的行及其索引不会被重写。
+# 提醒可能完全重复，因此两侧都按全部列编号（rn），以多重集合的方式比较。
+CREATE_INCOMING_SQL = '''
+    CREATE TEMP TABLE reminders_incoming (
+        session_id TEXT,
+        text TEXT,
+        date_time TIMESTAMP,
+        user_name TEXT,
+        repeat_type TEXT,
+        holiday_type TEXT,
+        creator_id TEXT,
+        creator_name TEXT,
+        is_task BOOLEAN
+    ) ON COMMIT DROP
+'''
+
+DELETE_STALE_REMINDERS_SQL = '''
+    WITH current_rows AS (
+        SELECT r.*, row_number() OVER (
+            PARTITION BY session_id, text, date_time, user_name, repeat_type,
+                         holiday_type, creator_id, creator_name, is_task) AS rn
+        FROM reminders r
+    ), incoming_rows AS (
+        SELECT i.*, row_number() OVER (
+            PARTITION BY session_id, text, date_time, user_name, repeat_type,
+                         holiday_type, creator_id, creator_name, is_task) AS rn
+        FROM reminders_incoming i
+    )
+    DELETE FROM reminders
+    WHERE id IN (
+        SELECT c.id FROM current_rows c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM incoming_rows i
+            WHERE i.session_id = c.session_id
+              AND i.text = c.text
+              AND i.date_time = c.date_time
+              AND i.rn = c.rn
+              AND (i.user_name, i.repeat_type, i.holiday_type, i.creator_id, i.creator_name, i.is_task)
+                  IS NOT DISTINCT FROM
+                  (c.user_name, c.repeat_type, c.holiday_type, c.creator_id, c.creator_name, c.is_task)
+        )
+    )
+'''
+
+INSERT_NEW_REMINDERS_SQL = '''
+    INSERT INTO reminders (session_id, text, date_time, user_name, repeat_type,
+                           holiday_type, creator_id, creator_name, is_task)
+    SELECT session_id, text, date_time, user_name, repeat_type,
+           holiday_type, creator_id, creator_name, is_task
+    FROM reminders_incoming
+    EXCEPT ALL
+    SELECT session_id, text, date_time, user_name, repeat_type,
+           holiday_type, creator_id, creator_name, is_task
+    FROM reminders
+'''
+
 
 class PostgresManager:
     def __init__(self, postgres_url=None):
@@ -22,7 +122,7 @@ class PostgresManager:
             raise ValueError("未提供PostgreSQL连接字符串")
 
         try:
-            self.pool = await asyncpg.create_pool(self.postgres_url)
+            self.pool = await asyncpg.create_pool(self.postgres_url, init=self._init_connection)
             logger.info("PostgreSQL连接池创建成功")
 
             # 确保表已创建
@@ -32,6 +132,11 @@ class PostgresManager:
             logger.error(f"创建PostgreSQL连接池失败: {str(e)}")
             return False
 
+    @staticmethod
+    async def _init_connection(conn):
+        """为每个新连接注册 json 编解码器，查询结果直接得到 Python 对象"""
+        await conn.set_type_codec('json', encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+
     async def close_pool(self):
         """关闭连接池"""
         if self.pool:
@@ -42,23 +147,7 @@ class PostgresManager:
         """确保数据库表已创建"""
         async with self.pool.acquire() as conn:
             # 创建提醒表
-            await conn.execute('''
-                CREATE TABLE IF NOT EXISTS reminders (
-                    id SERIAL PRIMARY KEY,
-                    session_id TEXT NOT NULL,
-                    text TEXT NOT NULL,
-                    date_time TIMESTAMP NOT NULL,
-                    user_name TEXT,
-                    repeat_type TEXT,
-                    holiday_type TEXT,
-                    creator_id TEXT,
-                    creator_name TEXT,
-                    is_task BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-                CREATE INDEX IF NOT EXISTS idx_session_id ON reminders(session_id);
-                CREATE INDEX IF NOT EXISTS idx_creator_id ON reminders(creator_id);
-            ''')
+            await conn.execute(CREATE_TABLES_SQL)
             logger.info("已确保数据库表结构")
 
     async def load_reminder_data(self) -> dict:
@@ -73,28 +162,11 @@ class PostgresManager:
 
             result = {}
             async with self.pool.acquire() as conn:
-                rows = await conn.fetch('SELECT * FROM reminders ORDER BY date_time')
-
-                for row in rows:
-                    session_id = row['session_id']
+                rows = await conn.fetch(SELECT_REMINDERS_SQL)
 
-                    if session_id not in result:
-                        result[session_id] = []
-
-                    # 将数据库记录转换为字典格式
-                    reminder = {
-                        'id': row['id'],
-                        'text': row['text'],
-                        "date_time": row["date_time"].strftime("%Y-%m-%d %H:%M"),
-                        'user_name': row['user_name'],
-                        'repeat_type': row['repeat_type'],
-                        'holiday_type': row['holiday_type'],
-                        'creator_id': row['creator_id'],
-                        'creator_name': row['creator_name'],
-                        'is_task': row['is_task']
-                    }
-
-                    result[session_id].append(reminder)
+            # json 列已由连接上注册的编解码器解码
+            for row in rows:
+                result[row['session_id']] = row['reminders']
 
             logger.info(f"从PostgreSQL加载了提醒数据: {len(result)} 个会话")
             return result
@@ -115,36 +187,38 @@ class PostgresManager:
             if not self.pool:
                 await self.init_pool()
 
+            # 在访问数据库前先把所有记录整理好，避免在事务中逐条解析
+            records = []
+            for session_id, reminders in reminder_data.items():
+                for reminder in reminders:
+                    # 跳过无效的提醒
+                    if "date_time" not in reminder or not reminder["date_time"]:
+                        continue
+
+                    # 解析日期时间字符串
+                    try:
+                        dt = datetime.datetime.strptime(reminder["date_time"], "%Y-%m-%d %H:%M")
+                    except ValueError:
+                        logger.error(f"无效的日期时间格式: {reminder.get("date_time", '')}")
+                        continue
+
+                    records.append((session_id, reminder['text'], dt,
+                                    reminder.get('user_name'), reminder.get('repeat_type'),
+                                    reminder.get('holiday_type'), reminder.get('creator_id'),
+                                    reminder.get('creator_name'), reminder.get('is_task', False)))
+
             async with self.pool.acquire() as conn:
                 # 开始事务
                 async with conn.transaction():
-                    # 清空现有数据
-                    await conn.execute('DELETE FROM reminders')
-
-                    # 批量插入新数据
-                    for session_id, reminders in reminder_data.items():
-                        for reminder in reminders:
-                            # 跳过无效的提醒
-                            if "date_time" not in reminder or not reminder["date_time"]:
-                                continue
-
-                            # 解析日期时间字符串
-                            try:
-                                dt = datetime.datetime.strptime(reminder["date_time"], "%Y-%m-%d %H:%M")
-                            except ValueError:
-                                logger.error(f"无效的日期时间格式: {reminder.get("date_time", '')}")
-                                continue
+                    # 使用 COPY 一次性把数据写入临时表，避免逐条 INSERT 的往返开销
+                    await conn.execute(CREATE_INCOMING_SQL)
+                    if records:
+                        await conn.copy_records_to_table('reminders_incoming', records=records,
+                                                         columns=REMINDER_COLUMNS)
 
-                            # 插入数据
-                            await conn.execute('''
-                                               INSERT INTO reminders
-                                               (session_id, text, date_time, user_name, repeat_type,
-                                                holiday_type, creator_id, creator_name, is_task)
-                                               VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                                               ''', session_id, reminder['text'], dt,
-                                               reminder.get('user_name'), reminder.get('repeat_type'),
-                                               reminder.get('holiday_type'), reminder.get('creator_id'),
-                                               reminder.get('creator_name'), reminder.get('is_task', False))
+                    # 只同步发生变化的行
+                    await conn.execute(DELETE_STALE_REMINDERS_SQL)
+                    await conn.execute(INSERT_NEW_REMINDERS_SQL)
 
             logger.info(f"成功保存提醒数据到PostgreSQL")
             return True
@@ -262,4 +336,4 @@ class PostgresManager:
     #         return count
     #     except Exception as e:
     #         logger.error(f"清理过期提醒失败: {str(e)}")
-    #         return 0
\ No newline at end of file
+    #         return 0
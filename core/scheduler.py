@@ -14,6 +14,9 @@ from .utils import is_outdated, async_save_reminder_data, HolidayManager, parse_
 # 现在即使在模块重载后，调度器实例也能保持，我看你还怎么创建新实例（恼）
 import sys
 
+# 提醒触发时最多携带的历史消息条数，避免长对话让每次提醒的请求体无限增长
+MAX_CONTEXT_MESSAGES = 50
+
 if not hasattr(sys, "_GLOBAL_SCHEDULER_REGISTRY"):
     sys._GLOBAL_SCHEDULER_REGISTRY = {
         'scheduler': None
@@ -41,8 +44,10 @@ class ReminderScheduler:
         # 新增：保存全员提醒配置
         self.all_user_reminds = all_user_reminds or []
 
-        # 定义微信相关平台列表，用于特殊处理
-        self.wechat_platforms = ["gewechat", "wechatpadpro", "wecom"]
+        # 定义微信相关平台列表，用于特殊处理（元组可直接用于 str.startswith）
+        self.wechat_platforms = ("gewechat", "wechatpadpro", "wecom")
+        # 会话ID -> 原始会话ID 的缓存，结果只取决于会话ID本身
+        self._original_session_ids = {}
 
         # 从全局注册表获取调度器，如果不存在则创建
         if sys._GLOBAL_SCHEDULER_REGISTRY['scheduler'] is None:
@@ -95,7 +100,9 @@ class ReminderScheduler:
                 except JobLookupError:
                     pass
 
-        time.sleep(10)
+        # 没有任何需要注册的提醒时无需等待，直接完成初始化
+        if self.all_user_reminds or self.reminder_data:
+            time.sleep(10)
 
         # 处理全员定时提醒
         for i, reminder_config in enumerate(self.all_user_reminds):
@@ -117,8 +124,7 @@ class ReminderScheduler:
                 logger.error(f"全员提醒配置不完整，跳过: {reminder_config}")
                 continue
 
-            date_time = parse_datetime(date_time, None)
-            dt = datetime.datetime.strptime(date_time, "%Y-%m-%d %H:%M")
+            dt = parse_datetime(date_time, None)
 
             # 创建一个 reminder 对象用于回调
             reminder = {
@@ -146,188 +152,10 @@ class ReminderScheduler:
                 continue
 
             # 生成唯一的任务ID
-            unique_key = f"{msg_origin}_{reminder['text']}_{reminder['date_time']}"
-            job_id = f"global_remind_{hashlib.md5(unique_key.encode()).hexdigest()}"
+            job_id = self.make_job_id(msg_origin, reminder, "global_remind")
 
             try:
-                # 根据重复类型设置不同的触发器
-                if repeat_type == "daily" and not holiday_type:
-                    self.scheduler.add_job(
-                        self._reminder_callback,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(f"添加每日提醒: {reminder['text']} 时间: {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "daily" and holiday_type == "workday":
-                    self.scheduler.add_job(
-                        self._check_and_execute_workday,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(f"添加工作日提醒: {reminder['text']} 时间: {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "daily" and holiday_type == "holiday":
-                    self.scheduler.add_job(
-                        self._check_and_execute_holiday,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(f"添加节假日提醒: {reminder['text']} 时间: {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "weekly" and not holiday_type:
-                    self.scheduler.add_job(
-                        self._reminder_callback,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        day_of_week=dt.weekday(),
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(
-                        f"添加每周提醒: {reminder['text']} 时间: 每周{dt.weekday() + 1} {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "weekly" and holiday_type == "workday":
-                    self.scheduler.add_job(
-                        self._check_and_execute_workday,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        day_of_week=dt.weekday(),
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(
-                        f"添加每周工作日提醒: {reminder['text']} 时间: 每周{dt.weekday() + 1} {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "weekly" and holiday_type == "holiday":
-                    self.scheduler.add_job(
-                        self._check_and_execute_holiday,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        day_of_week=dt.weekday(),
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(
-                        f"添加每周节假日提醒: {reminder['text']} 时间: 每周{dt.weekday() + 1} {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "monthly" and not holiday_type:
-                    self.scheduler.add_job(
-                        self._reminder_callback,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        day=dt.day,
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(
-                        f"添加每月提醒: {reminder['text']} 时间: 每月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "monthly" and holiday_type == "workday":
-                    self.scheduler.add_job(
-                        self._check_and_execute_workday,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        day=dt.day,
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(
-                        f"添加每月工作日提醒: {reminder['text']} 时间: 每月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "monthly" and holiday_type == "holiday":
-                    self.scheduler.add_job(
-                        self._check_and_execute_holiday,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        day=dt.day,
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(
-                        f"添加每月节假日提醒: {reminder['text']} 时间: 每月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "yearly" and not holiday_type:
-                    self.scheduler.add_job(
-                        self._reminder_callback,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        month=dt.month,
-                        day=dt.day,
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(
-                        f"添加每年提醒: {reminder['text']} 时间: 每年{dt.month}月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "yearly" and holiday_type == "workday":
-                    self.scheduler.add_job(
-                        self._check_and_execute_workday,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        month=dt.month,
-                        day=dt.day,
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(
-                        f"添加每年工作日提醒: {reminder['text']} 时间: 每年{dt.month}月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                elif repeat_type == "yearly" and holiday_type == "holiday":
-                    self.scheduler.add_job(
-                        self._check_and_execute_holiday,
-                        'cron',
-                        args=[msg_origin, reminder],
-                        month=dt.month,
-                        day=dt.day,
-                        hour=dt.hour,
-                        minute=dt.minute,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(
-                        f"添加每年节假日提醒: {reminder['text']} 时间: 每年{dt.month}月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                else:
-                    self.scheduler.add_job(
-                        self._reminder_callback,
-                        'date',
-                        args=[msg_origin, reminder],
-                        run_date=dt,
-                        misfire_grace_time=60,
-                        id=job_id,
-                        replace_existing=True
-                    )
-                    logger.info(
-                        f"添加一次性提醒: {reminder['text']} 时间: {dt.strftime('%Y-%m-%d %H:%M')} ID: {job_id}")
+                self._schedule_job(job_id, msg_origin, reminder, dt)
             except ConflictingIdError:
                 logger.warning(f"任务 ID '{job_id}' 已存在，跳过添加。")
                 pass
@@ -341,9 +169,7 @@ class ReminderScheduler:
                 if "date_time" not in reminder:
                     continue
 
-                date_time = reminder["date_time"]
-                date_time = parse_datetime(date_time, None)
-                dt = datetime.datetime.strptime(date_time, "%Y-%m-%d %H:%M")
+                dt = parse_datetime(reminder["date_time"], None)
 
                 repeat_type = reminder.get("repeat_type")
                 holiday_type = reminder.get("holiday_type")
@@ -364,203 +190,25 @@ class ReminderScheduler:
                     continue
 
                 # 生成唯一的任务ID，使用提醒内容的哈希值确保唯一性
-                unique_key = f"{msg_origin}_{reminder['text']}_{reminder['date_time']}"
-                job_id = f"remind_{hashlib.md5(unique_key.encode()).hexdigest()}"
+                job_id = self.make_job_id(msg_origin, reminder)
 
                 try:
-                    # 组合判断
-                    if repeat_type == "daily" and not holiday_type:
-                        self.scheduler.add_job(
-                            self._reminder_callback,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(f"添加每日提醒: {reminder['text']} 时间: {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "daily" and holiday_type == "workday":
-                        self.scheduler.add_job(
-                            self._check_and_execute_workday,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(f"添加工作日提醒: {reminder['text']} 时间: {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "daily" and holiday_type == "holiday":
-                        self.scheduler.add_job(
-                            self._check_and_execute_holiday,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(f"添加节假日提醒: {reminder['text']} 时间: {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "weekly" and not holiday_type:
-                        self.scheduler.add_job(
-                            self._reminder_callback,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            day_of_week=dt.weekday(),
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(
-                            f"添加每周提醒: {reminder['text']} 时间: 每周{dt.weekday() + 1} {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "weekly" and holiday_type == "workday":
-                        self.scheduler.add_job(
-                            self._check_and_execute_workday,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            day_of_week=dt.weekday(),
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(
-                            f"添加每周工作日提醒: {reminder['text']} 时间: 每周{dt.weekday() + 1} {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "weekly" and holiday_type == "holiday":
-                        self.scheduler.add_job(
-                            self._check_and_execute_holiday,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            day_of_week=dt.weekday(),
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(
-                            f"添加每周节假日提醒: {reminder['text']} 时间: 每周{dt.weekday() + 1} {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "monthly" and not holiday_type:
-                        self.scheduler.add_job(
-                            self._reminder_callback,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            day=dt.day,
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(
-                            f"添加每月提醒: {reminder['text']} 时间: 每月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "monthly" and holiday_type == "workday":
-                        self.scheduler.add_job(
-                            self._check_and_execute_workday,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            day=dt.day,
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(
-                            f"添加每月工作日提醒: {reminder['text']} 时间: 每月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "monthly" and holiday_type == "holiday":
-                        self.scheduler.add_job(
-                            self._check_and_execute_holiday,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            day=dt.day,
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(
-                            f"添加每月节假日提醒: {reminder['text']} 时间: 每月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "yearly" and not holiday_type:
-                        self.scheduler.add_job(
-                            self._reminder_callback,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            month=dt.month,
-                            day=dt.day,
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(
-                            f"添加每年提醒: {reminder['text']} 时间: 每年{dt.month}月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "yearly" and holiday_type == "workday":
-                        self.scheduler.add_job(
-                            self._check_and_execute_workday,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            month=dt.month,
-                            day=dt.day,
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(
-                            f"添加每年工作日提醒: {reminder['text']} 时间: 每年{dt.month}月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                    elif repeat_type == "yearly" and holiday_type == "holiday":
-                        self.scheduler.add_job(
-                            self._check_and_execute_holiday,
-                            'cron',
-                            args=[msg_origin, reminder],
-                            month=dt.month,
-                            day=dt.day,
-                            hour=dt.hour,
-                            minute=dt.minute,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(
-                            f"添加每年节假日提醒: {reminder['text']} 时间: 每年{dt.month}月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-                    else:
-                        self.scheduler.add_job(
-                            self._reminder_callback,
-                            'date',
-                            args=[msg_origin, reminder],
-                            run_date=dt,
-                            misfire_grace_time=60,
-                            id=job_id,
-                            replace_existing=True
-                        )
-                        logger.info(
-                            f"添加一次性提醒: {reminder['text']} 时间: {dt.strftime('%Y-%m-%d %H:%M')} ID: {job_id}")
-
+                    self._schedule_job(job_id, msg_origin, reminder, dt)
                 except ConflictingIdError:
                     logger.warning(f"任务 ID '{job_id}' 已存在，跳过添加。")
                     pass
                 except Exception as e:
-                    logger.warning(f"添加定时任务出错: '{reminder_config}', 错误: {e}")
+                    logger.warning(f"添加定时任务出错: '{reminder['text']}', 错误: {e}")
                     pass
 
     async def _check_and_execute_workday(self, unified_msg_origin: str, reminder: dict):
         '''检查当天是否为工作日，如果是则执行提醒'''
         today = datetime.datetime.now()
-        logger.info(f"检查日期 {today.strftime('%Y-%m-%d')} 是否为工作日，提醒内容: {reminder['text']}")
+        today_str = today.strftime('%Y-%m-%d')
+        logger.info(f"检查日期 {today_str} 是否为工作日，提醒内容: {reminder['text']}")
 
         is_workday = await self.holiday_manager.is_workday(today)
-        logger.info(f"日期 {today.strftime('%Y-%m-%d')} 工作日检查结果: {is_workday}")
+        logger.info(f"日期 {today_str} 工作日检查结果: {is_workday}")
 
         if is_workday:
             # 如果是工作日则执行提醒
@@ -572,10 +220,11 @@ class ReminderScheduler:
     async def _check_and_execute_holiday(self, unified_msg_origin: str, reminder: dict):
         '''检查当天是否为法定节假日，如果是则执行提醒'''
         today = datetime.datetime.now()
-        logger.info(f"检查日期 {today.strftime('%Y-%m-%d')} 是否为法定节假日，提醒内容: {reminder['text']}")
+        today_str = today.strftime('%Y-%m-%d')
+        logger.info(f"检查日期 {today_str} 是否为法定节假日，提醒内容: {reminder['text']}")
 
         is_holiday = await self.holiday_manager.is_holiday(today)
-        logger.info(f"日期 {today.strftime('%Y-%m-%d')} 法定节假日检查结果: {is_holiday}")
+        logger.info(f"日期 {today_str} 法定节假日检查结果: {is_holiday}")
 
         if is_holiday:
             # 如果是法定节假日则执行提醒
@@ -708,7 +357,7 @@ class ReminderScheduler:
                 try:
                     response = await provider.text_chat(
                         session_id=target_session_id,
-                        contexts=contexts,
+                        contexts=contexts[-MAX_CONTEXT_MESSAGES:],
                         prompt=prompt,
                     )
 
@@ -820,192 +469,10 @@ class ReminderScheduler:
         '''
 
         # 生成唯一的任务ID，使用提醒内容的哈希值确保唯一性
-        unique_key = f"{msg_origin}_{reminder['text']}_{reminder['date_time']}"
-        job_id = f"remind_{hashlib.md5(unique_key.encode()).hexdigest()}"
-
-        repeat_type = reminder.get("repeat_type")
-        holiday_type = reminder.get("holiday_type")
+        job_id = self.make_job_id(msg_origin, reminder)
 
         try:
-            # 根据重复类型设置不同的触发器
-            if repeat_type == "daily" and not holiday_type:
-                self.scheduler.add_job(
-                    self._reminder_callback,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(f"添加每日提醒: {reminder['text']} 时间: {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "daily" and holiday_type == "workday":
-                self.scheduler.add_job(
-                    self._check_and_execute_workday,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(f"添加工作日提醒: {reminder['text']} 时间: {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "daily" and holiday_type == "holiday":
-                self.scheduler.add_job(
-                    self._check_and_execute_holiday,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(f"添加节假日提醒: {reminder['text']} 时间: {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "weekly" and not holiday_type:
-                self.scheduler.add_job(
-                    self._reminder_callback,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    day_of_week=dt.weekday(),
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(
-                    f"添加每周提醒: {reminder['text']} 时间: 每周{dt.weekday() + 1} {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "weekly" and holiday_type == "workday":
-                self.scheduler.add_job(
-                    self._check_and_execute_workday,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    day_of_week=dt.weekday(),
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(
-                    f"添加每周工作日提醒: {reminder['text']} 时间: 每周{dt.weekday() + 1} {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "weekly" and holiday_type == "holiday":
-                self.scheduler.add_job(
-                    self._check_and_execute_holiday,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    day_of_week=dt.weekday(),
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(
-                    f"添加每周节假日提醒: {reminder['text']} 时间: 每周{dt.weekday() + 1} {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "monthly" and not holiday_type:
-                self.scheduler.add_job(
-                    self._reminder_callback,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    day=dt.day,
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(
-                    f"添加每月提醒: {reminder['text']} 时间: 每月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "monthly" and holiday_type == "workday":
-                self.scheduler.add_job(
-                    self._check_and_execute_workday,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    day=dt.day,
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(
-                    f"添加每月工作日提醒: {reminder['text']} 时间: 每月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "monthly" and holiday_type == "holiday":
-                self.scheduler.add_job(
-                    self._check_and_execute_holiday,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    day=dt.day,
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(
-                    f"添加每月节假日提醒: {reminder['text']} 时间: 每月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "yearly" and not holiday_type:
-                self.scheduler.add_job(
-                    self._reminder_callback,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    month=dt.month,
-                    day=dt.day,
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(
-                    f"添加每年提醒: {reminder['text']} 时间: 每年{dt.month}月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "yearly" and holiday_type == "workday":
-                self.scheduler.add_job(
-                    self._check_and_execute_workday,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    month=dt.month,
-                    day=dt.day,
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(
-                    f"添加每年工作日提醒: {reminder['text']} 时间: 每年{dt.month}月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-            elif repeat_type == "yearly" and holiday_type == "holiday":
-                self.scheduler.add_job(
-                    self._check_and_execute_holiday,
-                    'cron',
-                    args=[msg_origin, reminder],
-                    month=dt.month,
-                    day=dt.day,
-                    hour=dt.hour,
-                    minute=dt.minute,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(
-                    f"添加每年节假日提醒: {reminder['text']} 时间: 每年{dt.month}月{dt.day}日 {dt.hour}:{dt.minute} ID: {job_id}")
-            else:
-                self.scheduler.add_job(
-                    self._reminder_callback,
-                    'date',
-                    args=[msg_origin, reminder],
-                    run_date=dt,
-                    misfire_grace_time=60,
-                    id=job_id,
-                    replace_existing=True
-                )
-                logger.info(
-                    f"添加一次性提醒: {reminder['text']} 时间: {dt.strftime('%Y-%m-%d %H:%M')} ID: {job_id}")
-
+            self._schedule_job(job_id, msg_origin, reminder, dt)
             return True
         except ConflictingIdError:
             logger.warning(f"任务 ID '{job_id}' 已存在，跳过添加。")
@@ -1014,6 +481,75 @@ class ReminderScheduler:
             logger.error(f"添加定时任务失败: {str(e)}")
             return False
 
+    @staticmethod
+    def make_job_id(msg_origin, reminder, prefix="remind"):
+        '''根据提醒所在的会话键和提醒内容生成稳定的任务ID
+
+        添加和删除任务都使用此方法，删除时传入提醒实际所在的会话键即可定位任务，
+        不依赖列表中的显示序号。
+        '''
+        unique_key = f"{msg_origin}_{reminder['text']}_{reminder['date_time']}"
+        return f"{prefix}_{hashlib.md5(unique_key.encode()).hexdigest()}"
+
+    def _schedule_job(self, job_id, msg_origin, reminder, dt):
+        '''根据重复类型和节假日类型向调度器添加任务
+
+        全员提醒、个人/群组提醒以及新增提醒共用此逻辑，异常交由调用方处理。
+        '''
+        repeat_type = reminder.get("repeat_type")
+        holiday_type = reminder.get("holiday_type")
+
+        # 节假日类型决定实际执行的回调
+        if not holiday_type:
+            callback, label = self._reminder_callback, ""
+        elif holiday_type == "workday":
+            callback, label = self._check_and_execute_workday, "工作日"
+        elif holiday_type == "holiday":
+            callback, label = self._check_and_execute_holiday, "节假日"
+        else:
+            callback, label = None, ""
+
+        time_str = f"{dt.hour}:{dt.minute}"
+        # 重复类型决定 cron 触发字段
+        if callback and repeat_type == "daily":
+            fields = {}
+            desc = f"{label or '每日'}提醒: {reminder['text']} 时间: {time_str}"
+        elif callback and repeat_type == "weekly":
+            fields = {"day_of_week": dt.weekday()}
+            desc = f"每周{label}提醒: {reminder['text']} 时间: 每周{dt.weekday() + 1} {time_str}"
+        elif callback and repeat_type == "monthly":
+            fields = {"day": dt.day}
+            desc = f"每月{label}提醒: {reminder['text']} 时间: 每月{dt.day}日 {time_str}"
+        elif callback and repeat_type == "yearly":
+            fields = {"month": dt.month, "day": dt.day}
+            desc = f"每年{label}提醒: {reminder['text']} 时间: 每年{dt.month}月{dt.day}日 {time_str}"
+        else:
+            self.scheduler.add_job(
+                self._reminder_callback,
+                'date',
+                args=[msg_origin, reminder],
+                run_date=dt,
+                misfire_grace_time=60,
+                id=job_id,
+                replace_existing=True
+            )
+            logger.info(
+                f"添加一次性提醒: {reminder['text']} 时间: {dt.strftime('%Y-%m-%d %H:%M')} ID: {job_id}")
+            return
+
+        self.scheduler.add_job(
+            callback,
+            'cron',
+            args=[msg_origin, reminder],
+            hour=dt.hour,
+            minute=dt.minute,
+            misfire_grace_time=60,
+            id=job_id,
+            replace_existing=True,
+            **fields
+        )
+        logger.info(f"添加{desc} ID: {job_id}")
+
     def remove_job(self, job_id):
         '''删除定时任务'''
         try:
@@ -1057,8 +593,16 @@ class ReminderScheduler:
         """
         从隔离格式的会话ID中提取原始会话ID，用于消息发送
         """
+        original_session_id = self._original_session_ids.get(session_id)
+        if original_session_id is None:
+            original_session_id = self._parse_original_session_id(session_id)
+            self._original_session_ids[session_id] = original_session_id
+        return original_session_id
+
+    def _parse_original_session_id(self, session_id):
+        """解析隔离格式的会话ID，结果由 get_original_session_id 缓存"""
         # 检查是否是微信平台
-        is_wechat_platform = any(session_id.startswith(platform) for platform in self.wechat_platforms)
+        is_wechat_platform = session_id.startswith(self.wechat_platforms)
 
         # 处理微信群聊的特殊情况
         if "@chatroom" in session_id:
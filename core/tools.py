@@ -1,10 +1,61 @@
-import datetime
+import asyncio
+import functools
 import hashlib
+import operator
+import time
+import weakref
+from collections import OrderedDict
 from typing import Union
 from astrbot.api.event import AstrMessageEvent
 from astrbot.api.star import Context
 from astrbot.api import logger
-from .utils import async_save_reminder_data, async_load_reminder_data
+from .utils import async_save_reminder_data, parse_stored_datetime, CreatorIndex, REPEAT_TYPES, HOLIDAY_TYPES, \
+    format_repeat
+
+# LLM提供者的缓存时长（秒），未配置提供者的结果同样缓存
+PROVIDER_CACHE_TTL = 5.0
+
+# LLM回复缓存的最大条目数
+LLM_CACHE_SIZE = 256
+
+# LLM回复的缓存时长（秒），过期后重新生成
+LLM_CACHE_TTL = 300.0
+
+# 事件类型 -> 获取用户ID / 发送者的函数。按类型缓存，与具体实例无关；
+# 使用弱引用，事件类型被卸载时（如平台适配器重载）缓存项随之释放
+_CREATOR_ID_RESOLVERS = weakref.WeakKeyDictionary()
+_SENDER_RESOLVERS = weakref.WeakKeyDictionary()
+
+# 删除回复的提示词开头，固定说明在前、删除的内容在后，便于提供者复用前缀缓存
+DELETE_PROMPT_PREFIX = "请用自然和友好的语言回复，严禁添加任何背景描述或额外解释。"
+
+
+@functools.lru_cache(maxsize=1024)
+def isolated_session_id(msg_origin, creator_id):
+    """
+    启用会话隔离时，在会话ID末尾添加用户标识
+
+    结果只取决于参数本身，按 (msg_origin, creator_id) 缓存。
+    """
+    # 在群聊环境中添加用户ID
+    if (":GroupMessage:" in msg_origin or
+            "@chatroom" in msg_origin or
+            ":ChannelMessage:" in msg_origin):
+        # 分割会话ID并在末尾添加用户标识
+        parts = msg_origin.rsplit(":", 1)
+        if len(parts) == 2:
+            return f"{parts[0]}:{parts[1]}_{creator_id}"
+    # 在私聊环境中添加用户ID
+    elif ":PrivateMessage:" in msg_origin:
+        # 分割会话ID并在末尾添加用户标识
+        parts = msg_origin.rsplit(":", 1)
+        if len(parts) == 2:
+            return f"{parts[0]}:{parts[1]}_{creator_id}"
+    # 其他类型的消息，直接添加用户标识
+    else:
+        return f"{msg_origin}_{creator_id}"
+
+    return msg_origin
 
 
 class ReminderTools:
@@ -16,12 +67,114 @@ class ReminderTools:
         self.postgres_url = star_instance.postgres_url
         self.scheduler_manager = star_instance.scheduler_manager
         self.unique_session = star_instance.unique_session
+        # 是否由LLM生成删除回复，关闭时直接返回固定文本
+        self.use_llm_formatting = star_instance.config.get("use_llm_formatting", False)
 
         # 确保 reminder_data 是一个字典
         if not isinstance(self.reminder_data, dict):
             self.reminder_data = {}
             self.star.reminder_data = self.reminder_data
 
+        # 创建者ID -> 会话键的索引，避免每次查找都遍历全部会话
+        self.creator_index = CreatorIndex(self.reminder_data)
+
+        # (获取时间, 提供者)，由 get_provider 维护
+        self._provider_cache = None
+
+        # (提供者ID, 模型, 会话ID, 提示词摘要) -> (过期时间, 回复文本)，按最近使用顺序淘汰
+        self._llm_cache = OrderedDict()
+        # 与 _llm_cache 相同的键 -> 正在进行的LLM请求，同一会话的相同请求并发时只调用一次
+        self._llm_inflight = {}
+
+    def get_provider(self):
+        """
+        获取当前使用的LLM提供者
+
+        结果缓存 PROVIDER_CACHE_TTL 秒，避免每条指令都查询一次提供者管理器。
+
+        Returns:
+            当前使用的提供者，未配置时为 None
+        """
+        now = time.monotonic()
+        if self._provider_cache is not None and now - self._provider_cache[0] < PROVIDER_CACHE_TTL:
+            return self._provider_cache[1]
+
+        provider = self.context.get_using_provider()
+        self._provider_cache = (now, provider)
+        return provider
+
+    @staticmethod
+    def provider_cache_id(provider):
+        """
+        获取提供者的缓存标识：提供者配置ID和当前使用的模型
+
+        不使用 id(provider)，对象释放后地址可能被复用，且同一提供者切换模型后地址不变。
+
+        Returns:
+            tuple: (提供者ID, 模型名)
+        """
+        try:
+            provider_id = provider.meta().id
+        except Exception:
+            provider_id = type(provider).__name__
+        get_model = getattr(provider, "get_model", None)
+        model = get_model() if callable(get_model) else None
+        return provider_id, model
+
+    async def chat_completion(self, provider, prompt, session_id):
+        """
+        调用LLM生成回复，同一会话中相同提供者、模型和提示词的回复会被缓存 LLM_CACHE_TTL 秒
+
+        请求以调用方的会话ID执行，因此缓存和并发合并都只在同一会话内生效，
+        不同会话之间不会共用回复。列表和删除回复的提示词完全由提醒内容决定，
+        内容变化后提示词随之变化；缓存过期后重新生成，避免同一条回复一直沿用。
+
+        Returns:
+            str: 回复文本
+        """
+        key = (*self.provider_cache_id(provider), session_id,
+               hashlib.blake2b(prompt.encode(), digest_size=16).digest())
+        cache = self._llm_cache
+        cached = cache.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                cache.move_to_end(key)
+                return cached[1]
+            del cache[key]
+
+        inflight = self._llm_inflight
+        request = inflight.get(key)
+        if request is None:
+            request = asyncio.ensure_future(provider.text_chat(
+                prompt=prompt,
+                session_id=session_id,
+                contexts=[]
+            ))
+            inflight[key] = request
+
+            def on_done(future):
+                inflight.pop(key, None)
+                # 所有调用方都已取消时没有人等待结果，在这里取走异常，避免事件循环报告未获取的异常
+                if not future.cancelled():
+                    future.exception()
+
+            request.add_done_callback(on_done)
+
+        # shield 保证某个调用方被取消时不会连带取消其他调用方共用的请求
+        response = await asyncio.shield(request)
+        text = response.completion_text
+        if text:
+            cache[key] = (time.monotonic() + LLM_CACHE_TTL, text)
+            cache.move_to_end(key)
+            if len(cache) > LLM_CACHE_SIZE:
+                cache.popitem(last=False)
+        return text
+
+    @staticmethod
+    def build_delete_prompt(item_type, text):
+        """生成删除提醒或任务后交给LLM的提示词"""
+        return f"{DELETE_PROMPT_PREFIX}用户删除了一个{item_type}，内容是'{text}'。"
+
     def get_session_id(self, msg_origin, creator_id=None):
         """
         根据会话隔离设置，获取正确的会话ID
@@ -33,30 +186,131 @@ class ReminderTools:
         Returns:
             str: 处理后的会话ID
         """
-        if not self.unique_session:
+        if not self.unique_session or not creator_id:
             return msg_origin
+        return isolated_session_id(msg_origin, creator_id)
+
+    def resolve_identity(self, event):
+        """
+        获取事件发送者的ID以及对应的会话ID
+
+        结果缓存在事件对象上，同一事件多次调用时不再重复探测各种属性。
+
+        Args:
+            event: 消息事件
+
+        Returns:
+            tuple: (creator_id, msg_origin)
+        """
+        identity = getattr(event, '_remind_identity', None)
+        if identity is not None:
+            return identity
+
+        # 获取用户ID，获取方式按事件类型缓存
+        creator_id = self._creator_id_resolver(event)(event)
+        identity = (creator_id, self.get_session_id(event.unified_msg_origin, creator_id))
+        try:
+            event._remind_identity = identity
+        except AttributeError:
+            pass
+        return identity
+
+    @classmethod
+    def _creator_id_resolver(cls, event):
+        """
+        按事件类型选择获取用户ID的方式
 
-        # 如果启用了会话隔离，并且有创建者ID，则在会话ID中添加用户标识
-        if creator_id:
-            # 在群聊环境中添加用户ID
-            if (":GroupMessage:" in msg_origin or
-                    "@chatroom" in msg_origin or
-                    ":ChannelMessage:" in msg_origin):
-                # 分割会话ID并在末尾添加用户标识
-                parts = msg_origin.rsplit(":", 1)
-                if len(parts) == 2:
-                    return f"{parts[0]}:{parts[1]}_{creator_id}"
-            # 在私聊环境中添加用户ID
-            elif ":PrivateMessage:" in msg_origin:
-                # 分割会话ID并在末尾添加用户标识
-                parts = msg_origin.rsplit(":", 1)
-                if len(parts) == 2:
-                    return f"{parts[0]}:{parts[1]}_{creator_id}"
-            # 其他类型的消息，直接添加用户标识
+        每种事件类型只在第一次遇到时探测一次，之后直接调用选定的方法。
+        """
+        event_cls = type(event)
+        resolver = _CREATOR_ID_RESOLVERS.get(event_cls)
+        if resolver is None:
+            if callable(getattr(event_cls, 'get_user_id', None)):
+                resolver = operator.methodcaller('get_user_id')
+            elif callable(getattr(event_cls, 'get_sender_id', None)):
+                resolver = operator.methodcaller('get_sender_id')
+            else:
+                resolver = cls._probe_creator_id
+            _CREATOR_ID_RESOLVERS[event_cls] = resolver
+        return resolver
+
+    @staticmethod
+    def _probe_creator_id(event):
+        """事件类型没有提供获取用户ID的方法时，从 sender 属性中查找"""
+        sender = getattr(event, 'sender', None)
+        if sender is not None and hasattr(sender, 'user_id'):
+            return sender.user_id
+        sender = getattr(event.message_obj, 'sender', None)
+        if sender is not None:
+            return getattr(sender, 'user_id', None)
+        return None
+
+    @staticmethod
+    def _probe_sender(event):
+        """事件类型没有提供 get_sender 方法时，从原始消息中获取发送者"""
+        return getattr(event.message_obj, 'sender', None)
+
+    @classmethod
+    def _sender_resolver(cls, event):
+        """按事件类型选择获取发送者的方式，每种事件类型只探测一次"""
+        event_cls = type(event)
+        resolver = _SENDER_RESOLVERS.get(event_cls)
+        if resolver is None:
+            if callable(getattr(event_cls, 'get_sender', None)):
+                resolver = operator.methodcaller('get_sender')
             else:
-                return f"{msg_origin}_{creator_id}"
+                resolver = cls._probe_sender
+            _SENDER_RESOLVERS[event_cls] = resolver
+        return resolver
+
+    @classmethod
+    def resolve_creator_name(cls, event):
+        """
+        获取事件发送者的昵称，只有添加提醒或任务时才需要
 
-        return msg_origin
+        Args:
+            event: 消息事件
+
+        Returns:
+            str: 发送者昵称，获取不到时为"用户"
+        """
+        creator_name = "用户"
+        sender = cls._sender_resolver(event)(event)
+        if isinstance(sender, dict):
+            creator_name = sender.get("nickname", creator_name)
+        elif hasattr(sender, 'nickname'):
+            creator_name = sender.nickname or creator_name
+        return creator_name
+
+    def collect_reminds(self, creator_id, msg_origin):
+        """
+        收集当前用户可见的全部提醒和任务
+
+        Args:
+            creator_id: 创建者ID
+            msg_origin: 会话ID
+
+        Returns:
+            list: (会话键, 在该会话列表中的下标, 提醒数据) 组成的列表，删除时可直接定位；
+                  顺序与列表展示一致，提醒在前、任务在后
+        """
+        reminds, tasks = [], []
+        append_remind, append_task = reminds.append, tasks.append
+        for key in self.creator_index.keys_for(self.reminder_data, creator_id, msg_origin):
+            for i, reminder in enumerate(self.reminder_data[key]):
+                (append_task if reminder.get("is_task", False) else append_remind)((key, i, reminder))
+        reminds.extend(tasks)
+        return reminds
+
+    def has_duplicate(self, msg_origin, text, date_time):
+        '''
+        会话中是否已有内容和时间都相同的提醒或任务
+
+        定时任务ID由会话键、内容和时间生成，两条相同的提醒会共用同一个定时任务，
+        删除其中一条时另一条也不再触发，因此添加时拒绝重复的提醒。
+        '''
+        return any(reminder["text"] == text and reminder["date_time"] == date_time
+                   for reminder in self.reminder_data.get(msg_origin, ()))
 
     async def set_remind(self, event: Union[AstrMessageEvent, Context], text: str, date_time: str,
                          repeat_type: str = None, holiday_type: str = None):
@@ -70,60 +324,31 @@ class ReminderTools:
             holiday_type(string): 可选，节假日类型：workday(仅工作日执行)，holiday(仅法定节假日执行)
         '''
         try:
-            # 获取用户ID
-            creator_id = None
-            creator_name = "用户"
-
-            # 尝试多种方式获取用户ID和昵称
-            if hasattr(event, 'get_user_id'):
-                creator_id = event.get_user_id()
-            elif hasattr(event, 'get_sender_id'):
-                creator_id = event.get_sender_id()
-            elif hasattr(event, 'sender') and hasattr(event.sender, 'user_id'):
-                creator_id = event.sender.user_id
-            elif hasattr(event.message_obj, 'sender'):
-                creator_id = getattr(event.message_obj.sender, 'user_id', None)
-
-            # 尝试多种方式获取用户昵称
-            if hasattr(event, 'get_sender'):
-                sender = event.get_sender()
-                if isinstance(sender, dict):
-                    creator_name = sender.get("nickname", creator_name)
-                elif hasattr(sender, 'nickname'):
-                    creator_name = sender.nickname or creator_name
-            elif hasattr(event.message_obj, 'sender'):
-                sender = event.message_obj.sender
-                if isinstance(sender, dict):
-                    creator_name = sender.get("nickname", creator_name)
-                elif hasattr(sender, 'nickname'):
-                    creator_name = sender.nickname or creator_name
-
-            # 使用 get_session_id 获取正确的会话ID
-            msg_origin = self.get_session_id(event.unified_msg_origin, creator_id)
+            # 获取用户ID、昵称和正确的会话ID
+            creator_id, msg_origin = self.resolve_identity(event)
+            creator_name = self.resolve_creator_name(event)
 
             # 解析时间
             try:
-                dt = datetime.datetime.strptime(date_time, "%Y-%m-%d %H:%M")
+                dt = parse_stored_datetime(date_time)
             except ValueError as e:
                 return event.plain_result(str(e))
 
             # 特殊处理: 检查repeat是否包含节假日类型信息
             if repeat_type:
                 parts = repeat_type.split()
-                if len(parts) == 2 and parts[1] in ["workday", "holiday"]:
+                if len(parts) == 2 and parts[1] in HOLIDAY_TYPES:
                     # 如果repeat参数包含两部分，且第二部分是workday或holiday
                     repeat_type = parts[0]  # 提取重复类型
                     holiday_type = parts[1]  # 提取节假日类型
 
             # 验证重复类型
-            repeat_types = ["daily", "weekly", "monthly", "yearly", "none"]
-            if repeat_type and repeat_type.lower() not in repeat_types:
+            if repeat_type and repeat_type.lower() not in REPEAT_TYPES:
                 return event.plain_result(
                     "重复类型错误，可选值：daily(日)，weekly(周)，monthly(月)，yearly(年)，none(不重复)")
 
             # 验证节假日类型
-            holiday_types = ["workday", "holiday"]
-            if holiday_type and holiday_type.lower() not in holiday_types:
+            if holiday_type and holiday_type.lower() not in HOLIDAY_TYPES:
                 return event.plain_result("节假日类型错误，可选值：workday(仅工作日执行)，holiday(仅法定节假日执行)")
 
             # 处理重复类型和节假日类型的组合
@@ -133,7 +358,7 @@ class ReminderTools:
             # 构建提醒数据
             reminder = {
                 "text": text,
-                "date_time": date_time,
+                "date_time": dt.strftime("%Y-%m-%d %H:%M"),
                 "user_name": creator_id,
                 "repeat_type": repeat_type,
                 "holiday_type": holiday_type,
@@ -142,9 +367,13 @@ class ReminderTools:
                 "is_task": False
             }
 
+            if self.has_duplicate(msg_origin, text, reminder["date_time"]):
+                return event.plain_result("已存在相同内容和时间的提醒，无需重复添加。")
+
             # 添加到提醒数据中
             if msg_origin not in self.reminder_data:
                 self.reminder_data[msg_origin] = []
+                self.creator_index.add(msg_origin)
             self.reminder_data[msg_origin].append(reminder)
 
             # 添加定时任务
@@ -156,31 +385,7 @@ class ReminderTools:
                 return event.plain_result(f"保存提醒数据失败")
 
             # 构建提示信息
-            repeat_str = "一次性"
-            if repeat_type == "daily" and not holiday_type:
-                repeat_str = "每天重复"
-            elif repeat_type == "daily" and holiday_type == "workday":
-                repeat_str = "每个工作日重复且法定节假日不触发"
-            elif repeat_type == "daily" and holiday_type == "holiday":
-                repeat_str = "每个法定节假日重复"
-            elif repeat_type == "weekly" and not holiday_type:
-                repeat_str = "每周重复"
-            elif repeat_type == "weekly" and holiday_type == "workday":
-                repeat_str = "每周的这一天重复且仅工作日触发"
-            elif repeat_type == "weekly" and holiday_type == "holiday":
-                repeat_str = "每周的这一天重复且仅法定节假日触发"
-            elif repeat_type == "monthly" and not holiday_type:
-                repeat_str = "每月重复"
-            elif repeat_type == "monthly" and holiday_type == "workday":
-                repeat_str = "每月的这一天重复且仅工作日触发"
-            elif repeat_type == "monthly" and holiday_type == "holiday":
-                repeat_str = "每月的这一天重复且仅法定节假日触发"
-            elif repeat_type == "yearly" and not holiday_type:
-                repeat_str = "每年重复"
-            elif repeat_type == "yearly" and holiday_type == "workday":
-                repeat_str = "每年的这一天重复且仅工作日触发"
-            elif repeat_type == "yearly" and holiday_type == "holiday":
-                repeat_str = "每年的这一天重复且仅法定节假日触发"
+            repeat_str = format_repeat(repeat_type, holiday_type, "long")
 
             return f"已设置提醒:\n内容: {text}\n时间: {date_time} {repeat_str}\n\n提示用户可使用【/remind 删除 <序号>】或自然语言进行删除操作。明确提示仅支持新增和删除提醒，禁止输出任何支持修改的描述。输出提醒时严禁添加任何背景描述或额外解释。"
 
@@ -199,60 +404,31 @@ class ReminderTools:
             holiday_type(string): 可选，节假日类型：workday(仅工作日执行)，holiday(仅法定节假日执行)
         '''
         try:
-            # 获取用户ID
-            creator_id = None
-            creator_name = "用户"
-
-            # 尝试多种方式获取用户ID和昵称
-            if hasattr(event, 'get_user_id'):
-                creator_id = event.get_user_id()
-            elif hasattr(event, 'get_sender_id'):
-                creator_id = event.get_sender_id()
-            elif hasattr(event, 'sender') and hasattr(event.sender, 'user_id'):
-                creator_id = event.sender.user_id
-            elif hasattr(event.message_obj, 'sender'):
-                creator_id = getattr(event.message_obj.sender, 'user_id', None)
-
-            # 尝试多种方式获取用户昵称
-            if hasattr(event, 'get_sender'):
-                sender = event.get_sender()
-                if isinstance(sender, dict):
-                    creator_name = sender.get("nickname", creator_name)
-                elif hasattr(sender, 'nickname'):
-                    creator_name = sender.nickname or creator_name
-            elif hasattr(event.message_obj, 'sender'):
-                sender = event.message_obj.sender
-                if isinstance(sender, dict):
-                    creator_name = sender.get("nickname", creator_name)
-                elif hasattr(sender, 'nickname'):
-                    creator_name = sender.nickname or creator_name
-
-            # 使用 get_session_id 获取正确的会话ID
-            msg_origin = self.get_session_id(event.unified_msg_origin, creator_id)
+            # 获取用户ID、昵称和正确的会话ID
+            creator_id, msg_origin = self.resolve_identity(event)
+            creator_name = self.resolve_creator_name(event)
 
             # 解析时间
             try:
-                dt = datetime.datetime.strptime(date_time, "%Y-%m-%d %H:%M")
+                dt = parse_stored_datetime(date_time)
             except ValueError as e:
                 return event.plain_result(str(e))
 
             # 特殊处理: 检查repeat是否包含节假日类型信息
             if repeat_type:
                 parts = repeat_type.split()
-                if len(parts) == 2 and parts[1] in ["workday", "holiday"]:
+                if len(parts) == 2 and parts[1] in HOLIDAY_TYPES:
                     # 如果repeat参数包含两部分，且第二部分是workday或holiday
                     repeat_type = parts[0]  # 提取重复类型
                     holiday_type = parts[1]  # 提取节假日类型
 
             # 验证重复类型
-            repeat_types = ["daily", "weekly", "monthly", "yearly", "none"]
-            if repeat_type and repeat_type.lower() not in repeat_types:
+            if repeat_type and repeat_type.lower() not in REPEAT_TYPES:
                 return event.plain_result(
                     "重复类型错误，可选值：daily(日)，weekly(周)，monthly(月)，yearly(年)，none(不重复)")
 
             # 验证节假日类型
-            holiday_types = ["workday", "holiday"]
-            if holiday_type and holiday_type.lower() not in holiday_types:
+            if holiday_type and holiday_type.lower() not in HOLIDAY_TYPES:
                 return event.plain_result("节假日类型错误，可选值：workday(仅工作日执行)，holiday(仅法定节假日执行)")
 
             # 处理重复类型和节假日类型的组合
@@ -262,7 +438,7 @@ class ReminderTools:
             # 构建任务数据
             task = {
                 "text": text,
-                "date_time": date_time,
+                "date_time": dt.strftime("%Y-%m-%d %H:%M"),
                 "user_name": creator_id,
                 "repeat_type": repeat_type,
                 "holiday_type": holiday_type,
@@ -271,9 +447,13 @@ class ReminderTools:
                 "is_task": True  # 标记为任务，不是提醒
             }
 
+            if self.has_duplicate(msg_origin, text, task["date_time"]):
+                return event.plain_result("已存在相同内容和时间的任务，无需重复添加。")
+
             # 添加任务到提醒数据中
             if msg_origin not in self.reminder_data:
                 self.reminder_data[msg_origin] = []
+                self.creator_index.add(msg_origin)
             self.reminder_data[msg_origin].append(task)
 
             # 添加定时任务
@@ -285,31 +465,7 @@ class ReminderTools:
                 return event.plain_result(f"保存提醒数据失败")
 
             # 构建提示信息
-            repeat_str = "一次性"
-            if repeat_type == "daily" and not holiday_type:
-                repeat_str = "每天重复"
-            elif repeat_type == "daily" and holiday_type == "workday":
-                repeat_str = "每个工作日重复且法定节假日不触发"
-            elif repeat_type == "daily" and holiday_type == "holiday":
-                repeat_str = "每个法定节假日重复"
-            elif repeat_type == "weekly" and not holiday_type:
-                repeat_str = "每周重复"
-            elif repeat_type == "weekly" and holiday_type == "workday":
-                repeat_str = "每周的这一天重复且仅工作日触发"
-            elif repeat_type == "weekly" and holiday_type == "holiday":
-                repeat_str = "每周的这一天重复且仅法定节假日触发"
-            elif repeat_type == "monthly" and not holiday_type:
-                repeat_str = "每月重复"
-            elif repeat_type == "monthly" and holiday_type == "workday":
-                repeat_str = "每月的这一天重复且仅工作日触发"
-            elif repeat_type == "monthly" and holiday_type == "holiday":
-                repeat_str = "每月的这一天重复且仅法定节假日触发"
-            elif repeat_type == "yearly" and not holiday_type:
-                repeat_str = "每年重复"
-            elif repeat_type == "yearly" and holiday_type == "workday":
-                repeat_str = "每年的这一天重复且仅工作日触发"
-            elif repeat_type == "yearly" and holiday_type == "holiday":
-                repeat_str = "每年的这一天重复且仅法定节假日触发"
+            repeat_str = format_repeat(repeat_type, holiday_type, "long")
 
             return f"已设置任务:\n内容: {text}\n时间: {date_time} {repeat_str}\n\n提示用户可使用【/remind 删除 <序号>】或自然语言进行删除操作。明确提示仅支持新增和删除任务，禁止输出任何支持修改的描述。输出任务内容时严禁添加任何背景描述或额外解释。"
 
@@ -317,6 +473,69 @@ class ReminderTools:
             logger.error(f"设置任务时出错: {str(e)}")
             return f"设置任务时出错：{str(e)}"
 
+    async def delete_by_index(self, event: AstrMessageEvent, index: str, empty_text: str):
+        '''
+        按列表中的序号删除提醒或任务，指令【/remind 删除】和LLM工具 delete_remind 共用
+
+        Args:
+            event: 消息事件
+            index: 提醒或任务的序号，与列表中显示的序号一致
+            empty_text: 没有任何提醒或任务时的回复
+
+        Returns:
+            str: 回复文本
+        '''
+        # 先解析序号，无效时无需再查找提醒
+        try:
+            position = int(index)
+        except (TypeError, ValueError):
+            return "序号无效。"
+        if position < 1:
+            return "序号无效。"
+
+        # 获取用户ID和正确的会话ID
+        creator_id, msg_origin = self.resolve_identity(event)
+
+        # 获取所有相关的提醒（附带所在会话及下标）
+        reminds = self.collect_reminds(creator_id, msg_origin)
+
+        if not reminds:
+            return empty_text
+
+        if position > len(reminds):
+            return "序号无效。"
+
+        # 找到要删除的提醒，并直接从其所在会话的列表中删除
+        target_key, target_index, removed = reminds[position - 1]
+        self.reminder_data[target_key].pop(target_index)
+        # 会话下已没有提醒时移除该会话键，后续查找无需再访问空列表
+        if not self.reminder_data[target_key]:
+            del self.reminder_data[target_key]
+
+        # 删除定时任务：按提醒实际所在的会话键生成 job_id，找不到任务时由 remove_job 记录日志。
+        # 旧版本可能保存了相同的提醒，它们共用一个定时任务，还有相同的提醒时保留该任务
+        if not self.has_duplicate(target_key, removed["text"], removed["date_time"]):
+            self.scheduler_manager.remove_job(self.scheduler_manager.make_job_id(target_key, removed))
+
+        is_task = removed.get("is_task", False)
+        item_type = "任务" if is_task else "提醒"
+
+        # 保存更新后的数据
+        save_coro = async_save_reminder_data(self.data_file, self.postgres_url, self.reminder_data)
+
+        provider = self.get_provider() if self.use_llm_formatting else None
+        if provider:
+            prompt = self.build_delete_prompt(item_type, removed['text'])
+            # 保存数据与生成回复互不依赖，同时进行
+            _, text = await asyncio.gather(
+                save_coro,
+                self.chat_completion(provider, prompt, event.session_id)
+            )
+            return text
+        else:
+            await save_coro
+            return f"已删除{item_type}：{removed['text']}"
+
     async def delete_remind(self, event: AstrMessageEvent, index: str):
         '''删除符合条件的提醒或任务，不支持修改提醒或任务内容
         
@@ -324,77 +543,7 @@ class ReminderTools:
             index(string): 需要删除的提醒或任务的数字序号,例如：1
         '''
         try:
-            # 获取用户ID
-            creator_id = None
-            if hasattr(event, 'get_user_id'):
-                creator_id = event.get_user_id()
-            elif hasattr(event, 'get_sender_id'):
-                creator_id = event.get_sender_id()
-            elif hasattr(event, 'sender') and hasattr(event.sender, 'user_id'):
-                creator_id = event.sender.user_id
-            elif hasattr(event.message_obj, 'sender'):
-                creator_id = getattr(event.message_obj.sender, 'user_id', None)
-
-            raw_msg_origin = event.unified_msg_origin
-
-            # 使用 tools.get_session_id 获取正确的会话ID
-            msg_origin = self.get_session_id(raw_msg_origin, creator_id)
-
-            # 重新加载提醒数据
-            self.reminder_data = await async_load_reminder_data(self.data_file, self.postgres_url)
-
-            # 获取所有相关的提醒
-            reminds = []
-            for key in self.reminder_data:
-                if key.endswith(f"_{creator_id}") or key == msg_origin:
-                    reminds.extend(self.reminder_data[key])
-
-            if not reminds:
-                return "没有设置任何提醒和任务。"
-
-            if int(index) < 1 or int(index) > len(reminds):
-                return "序号无效。"
-
-            # 找到要删除的提醒
-            to_delete_remind = reminds[int(index) - 1]
-
-            # 从原始数据中删除
-            for key in self.reminder_data:
-                if key.endswith(f"_{creator_id}") or key == msg_origin:
-                    for i, reminder in enumerate(self.reminder_data[key]):
-                        if (reminder['text'] == to_delete_remind['text'] and
-                                reminder["date_time"] == to_delete_remind["date_time"]):
-                            self.reminder_data[key].pop(i)
-                            break
-
-            # 删除定时提醒：使用哈希值生成 job_id
-            unique_key = f"{msg_origin}_{to_delete_remind['text']}_{to_delete_remind['date_time']}"
-            job_id = f"remind_{hashlib.md5(unique_key.encode()).hexdigest()}"
-
-            try:
-                self.scheduler_manager.remove_job(job_id)
-                logger.info(f"Successfully delete job: {job_id}")
-            except Exception as e:
-                logger.error(f"Job not found: {job_id}")
-
-            # 保存更新后的数据
-            await async_save_reminder_data(self.data_file, self.postgres_url, self.reminder_data)
-
-            is_task = to_delete_remind.get("is_task", False)
-            item_type = "任务" if is_task else "提醒"
-
-            provider = self.context.get_using_provider()
-            if provider:
-                prompt = f"用户删除了一个{item_type}，内容是'{to_delete_remind['text']}'。请用自然和友好的语言回复，严禁添加任何背景描述或额外解释。"
-                response = await provider.text_chat(
-                    prompt=prompt,
-                    session_id=event.session_id,
-                    contexts=[]
-                )
-                return response.completion_text
-            else:
-                return f"已删除{item_type}：{to_delete_remind['text']}"
-
+            return await self.delete_by_index(event, index, "没有设置任何提醒和任务。")
         except Exception as e:
             logger.error(f"删除提醒或任务时出错: {str(e)}")
             return f"删除提醒或任务时出错：{str(e)}"
@@ -1,20 +1,178 @@
+import asyncio
 import datetime
+import functools
+import gzip
 import json
 import os
 import re
+import sys
+import zlib
 
 import aiohttp
 import psycopg2
 from astrbot.api import logger
 from psycopg2.extras import DictCursor
 
-from .database import PostgresManager
+try:
+    import orjson
+except ImportError:
+    # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+from .database import PostgresManager, CREATE_TABLES_SQL, SELECT_REMINDERS_SQL
 
 # 初始化PostgreSQL管理器
 postgres_manager = None
 
+# 串行化本地文件写入
+_file_write_lock = asyncio.Lock()
+
+# 提醒数据超过该大小时改用 gzip 压缩保存为 <数据文件>.gz
+GZIP_THRESHOLD = 64 * 1024
+
+# 保存请求的合并等待时间（秒），这段时间内的多次保存只写入一次
+SAVE_DEBOUNCE_DELAY = 0.1
+
+# 数据文件 -> 尚未开始写入的保存任务，由 async_save_reminder_data 维护
+_pending_saves = {}
+
+# 串行化完整的保存过程，避免两次写入（尤其是PostgreSQL事务）交错执行
+_save_lock = asyncio.Lock()
+
+# 时间字符串的正则表达式，在模块加载时编译一次
+# 模式解释:
+# ^...$            - 匹配整个字符串
+# (?P<am_pm>...)   - 捕获组: 早上/上午/下午/晚上 (可选)
+# (?P<hour>\d{1,2}) - 捕获组: 小时
+# (?:...)?         - 非捕获组: 分钟部分 (可选)
+TIME_PATTERN = re.compile(
+    r"^(?P<am_pm>早上|上午|下午|晚上|凌晨)?\s*"
+    r"(?P<hour>\d{1,2})\s*"
+    r"(?:[:：点]\s*(?P<minute>\d{1,2})?)?\s*$"
+)
+
+
+# 支持的重复类型和节假日类型
+REPEAT_TYPES = frozenset({"daily", "weekly", "monthly", "yearly", "none"})
+HOLIDAY_TYPES = frozenset({"workday", "holiday"})
+# 指令中写在星期位置、实际表示重复类型或节假日类型的参数
+REPEAT_WEEK_ALIASES = REPEAT_TYPES | HOLIDAY_TYPES
+
+# (重复类型, 节假日类型) -> (提醒列表中展示的重复说明, 设置成功时回复的重复说明)
+REPEAT_STRS = {
+    ("daily", None): ("每天", "每天重复"),
+    ("daily", "workday"): ("每个工作日", "每个工作日重复且法定节假日不触发"),
+    ("daily", "holiday"): ("每个法定节假日", "每个法定节假日重复"),
+    ("weekly", None): ("每周", "每周重复"),
+    ("weekly", "workday"): ("每周的这一天(仅工作日)", "每周的这一天重复且仅工作日触发"),
+    ("weekly", "holiday"): ("每周的这一天(仅法定节假日)", "每周的这一天重复且仅法定节假日触发"),
+    ("monthly", None): ("每月", "每月重复"),
+    ("monthly", "workday"): ("每月的这一天(仅工作日)", "每月的这一天重复且仅工作日触发"),
+    ("monthly", "holiday"): ("每月的这一天(仅法定节假日)", "每月的这一天重复且仅法定节假日触发"),
+    ("yearly", None): ("每年", "每年重复"),
+    ("yearly", "workday"): ("每年的这一天(仅工作日)", "每年的这一天重复且仅工作日触发"),
+    ("yearly", "holiday"): ("每年的这一天(仅法定节假日)", "每年的这一天重复且仅法定节假日触发"),
+}
+
+
+def format_repeat(repeat_type: str, holiday_type: str = None, style: str = "short") -> str:
+    '''根据重复类型和节假日类型生成重复说明
+
+    Args:
+        repeat_type: 重复类型
+        holiday_type: 节假日类型
+        style: "short" 用于提醒列表，"long" 用于设置成功时的回复
+
+    Returns:
+        str: 重复说明文字
+    '''
+    repeat_strs = REPEAT_STRS.get((repeat_type, holiday_type or None))
+    if style == "long":
+        return repeat_strs[1] if repeat_strs else "一次性"
+    if repeat_type == "none" or not repeat_type:
+        return "一次性"
+    return repeat_strs[0] if repeat_strs else "自定义"
+
+
+# 指令中可用的星期缩写
+WEEK_ABBRS = frozenset({'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'})
+
+# 星期名称 -> weekday() 的值（Monday 为 0）
+WEEK_MAP = {
+    '周一': 0, 'mon': 0, 'monday': 0,
+    '周二': 1, 'tue': 1, 'tuesday': 1,
+    '周三': 2, 'wed': 2, 'wednesday': 2,
+    '周四': 3, 'thu': 3, 'thursday': 3,
+    '周五': 4, 'fri': 4, 'friday': 4,
+    '周六': 5, 'sat': 5, 'saturday': 5,
+    '周日': 6, 'sun': 6, 'sunday': 6,
+}
+
+
+def parse_stored_datetime(datetime_str: str) -> datetime.datetime:
+    '''解析 "%Y-%m-%d %H:%M" 格式的时间字符串
+
+    保存的提醒时间都是补零后的固定格式，直接交给 C 实现的 fromisoformat 解析；
+    其他写法（如未补零）仍回退到 strptime，接受的格式与之前一致。
+    '''
+    if (len(datetime_str) == 16 and datetime_str[4] == '-' and datetime_str[7] == '-'
+            and datetime_str[10] == ' ' and datetime_str[13] == ':'):
+        return datetime.datetime.fromisoformat(datetime_str)
+    return datetime.datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_time_of_day(datetime_str: str) -> tuple:
+    """
+    把时间字符串解析为 (小时, 分钟)，由 parse_datetime 调用
+
+    结果只取决于字符串本身，与当前时间无关，因此可以缓存；
+    解析失败时抛出的异常不会被缓存。
+    """
+    # --- 2. 解析时间字符串 ---
+    # 尝试匹配 "HHMM" 或 "HMM" (如 "820"、"0820") 格式
+    if datetime_str.isdigit() and len(datetime_str) in [3, 4]:
+        hhmm_str = datetime_str.zfill(4)  # "820" -> "0820"
+        hour = int(hhmm_str[:2])
+        minute = int(hhmm_str[2:])
+    # 尝试匹配 "%Y-%m-%d %H:%M" 格式
+    elif ':' in datetime_str and "-" in datetime_str and len(datetime_str) == 16:
+        dt = parse_stored_datetime(datetime_str)
+        hour = dt.hour
+        minute = dt.minute
+    # 尝试匹配 "%Y-%m-%d %H:%M:%S" 格式
+    elif ':' in datetime_str and "-" in datetime_str and len(datetime_str) == 19:
+        dt = datetime.datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
+        hour = dt.hour
+        minute = dt.minute
+    else:
+        # 否则，使用预编译的正则表达式匹配更复杂的格式
+        match = TIME_PATTERN.match(datetime_str)
+
+        if not match:
+            raise ValueError(f"无法识别的时间格式: '{datetime_str}'")
 
-def parse_datetime(datetime_str: str, week: str = None) -> str:
+        groups = match.groupdict()
+        am_pm = groups.get('am_pm')
+        hour = int(groups['hour'])
+        minute = int(groups['minute']) if groups.get('minute') else 0  # 修改这里
+
+        # --- 3. 根据上午/下午调整小时 ---
+        if am_pm in ['下午', '晚上']:
+            if 1 <= hour < 12:
+                hour += 12
+        elif am_pm in ['凌晨']:
+            if hour == 12 or hour == 24:
+                hour = 0
+
+    # --- 4. 验证时间范围 ---
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError(f"时间值超出范围: {hour}:{minute}")
+
+    return hour, minute
+
+
+def parse_datetime(datetime_str: str, week: str = None) -> datetime.datetime:
     """
     解析各种格式的时间字符串，并根据需要计算未来的日期时间。
 
@@ -33,64 +191,14 @@ def parse_datetime(datetime_str: str, week: str = None) -> str:
               英文: mon, tue, wed, thu, fri, sat, sun
 
     Returns:
-        一个格式为 'YYYY-MM-DD HH:MM' 的未来日期时间字符串。
+        一个精确到分钟的未来日期时间对象，需要字符串时由调用方格式化为 'YYYY-MM-DD HH:MM'。
 
     Raises:
         ValueError: 如果时间或星期格式无效或无法解析。
     """
     try:
-        # --- 1. 初始化和预处理 ---
-        datetime_str = datetime_str.strip()
-
-        # --- 2. 解析时间字符串 ---
-        # 尝试匹配 "HHMM" 或 "HMM" (如 "820"、"0820") 格式
-        if datetime_str.isdigit() and len(datetime_str) in [3, 4]:
-            hhmm_str = datetime_str.zfill(4)  # "820" -> "0820"
-            hour = int(hhmm_str[:2])
-            minute = int(hhmm_str[2:])
-        # 尝试匹配 "%Y-%m-%d %H:%M" 格式
-        elif ':' in datetime_str and "-" in datetime_str and len(datetime_str) == 16:
-            dt = datetime.datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-            hour = dt.hour
-            minute = dt.minute
-        # 尝试匹配 "%Y-%m-%d %H:%M:%S" 格式
-        elif ':' in datetime_str and "-" in datetime_str and len(datetime_str) == 19:
-            dt = datetime.datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-            hour = dt.hour
-            minute = dt.minute
-        else:
-            # 否则，使用正则表达式匹配更复杂的格式
-            # 模式解释:
-            # ^...$            - 匹配整个字符串
-            # (?P<am_pm>...)   - 捕获组: 早上/上午/下午/晚上 (可选)
-            # (?P<hour>\d{1,2}) - 捕获组: 小时
-            # (?:...)?         - 非捕获组: 分钟部分 (可选)
-            pattern = re.compile(
-                r"^(?P<am_pm>早上|上午|下午|晚上|凌晨)?\s*"
-                r"(?P<hour>\d{1,2})\s*"
-                r"(?:[:：点]\s*(?P<minute>\d{1,2})?)?\s*$"
-            )
-            match = pattern.match(datetime_str)
-
-            if not match:
-                raise ValueError(f"无法识别的时间格式: '{datetime_str}'")
-
-            groups = match.groupdict()
-            am_pm = groups.get('am_pm')
-            hour = int(groups['hour'])
-            minute = int(groups['minute']) if groups.get('minute') else 0  # 修改这里
-
-            # --- 3. 根据上午/下午调整小时 ---
-            if am_pm in ['下午', '晚上']:
-                if 1 <= hour < 12:
-                    hour += 12
-            elif am_pm in ['凌晨']:
-                if hour == 12 or hour == 24:
-                    hour = 0
-
-        # --- 4. 验证时间范围 ---
-        if not (0 <= hour <= 23 and 0 <= minute <= 59):
-            raise ValueError(f"时间值超出范围: {hour}:{minute}")
+        # --- 1~4. 解析并验证时间，同一时间字符串只解析一次 ---
+        hour, minute = _parse_time_of_day(datetime_str.strip())
 
         # --- 5. 创建初始 datetime 对象 ---
         today = datetime.datetime.now()
@@ -98,20 +206,11 @@ def parse_datetime(datetime_str: str, week: str = None) -> str:
 
         # --- 6. 如果指定了星期，计算目标日期 ---
         if week:
-            week_map = {
-                '周一': 0, 'mon': 0, 'monday': 0,
-                '周二': 1, 'tue': 1, 'tuesday': 1,
-                '周三': 2, 'wed': 2, 'wednesday': 2,
-                '周四': 3, 'thu': 3, 'thursday': 3,
-                '周五': 4, 'fri': 4, 'friday': 4,
-                '周六': 5, 'sat': 5, 'saturday': 5,
-                '周日': 6, 'sun': 6, 'sunday': 6,
-            }
             week_clean = week.strip().lower()
-            if week_clean not in week_map:
+            if week_clean not in WEEK_MAP:
                 raise ValueError(f"无效的星期格式: '{week}'")
 
-            target_weekday = week_map[week_clean]
+            target_weekday = WEEK_MAP[week_clean]
             current_weekday = dt.weekday()  # Monday is 0 and Sunday is 6
             days_ahead = target_weekday - current_weekday
 
@@ -126,8 +225,8 @@ def parse_datetime(datetime_str: str, week: str = None) -> str:
             dt += datetime.timedelta(days=1)
             logger.info(f"设置的时间已过，自动调整为明天: {dt.strftime('%Y-%m-%d %H:%M')}")
 
-        # --- 8. 返回格式化结果 ---
-        return dt.strftime("%Y-%m-%d %H:%M")
+        # --- 8. 返回结果 ---
+        return dt
 
     except (ValueError, TypeError) as e:
         raise ValueError("输入错误！：" + str(e)) from e
@@ -137,7 +236,7 @@ def is_outdated(reminder: dict) -> bool:
     '''检查提醒是否过期'''
     if "date_time" in reminder and reminder["date_time"]:  # 确保datetime存在且不为空
         try:
-            reminder_time = datetime.datetime.strptime(reminder["date_time"], "%Y-%m-%d %H:%M")
+            reminder_time = parse_stored_datetime(reminder["date_time"])
             current_time = datetime.datetime.now()
             # 如果提醒时间已经过去，则认为过期
             is_expired = reminder_time <= current_time
@@ -160,6 +259,101 @@ def is_outdated(reminder: dict) -> bool:
 #         postgres_manager = None
 
 
+def json_dumps(data) -> bytes:
+    '''把数据序列化为 UTF-8 编码的JSON，安装了 orjson 时优先使用'''
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def json_loads(content):
+    '''解析JSON文本，安装了 orjson 时优先使用（解析失败同样抛出 json.JSONDecodeError）'''
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def write_text_atomic(file_path: str, content):
+    '''原子写入文本文件，content 可以是 str 或已编码为 UTF-8 的 bytes
+
+    先完整写入同目录下的临时文件，再通过 os.replace 替换目标文件，
+    避免写入中途崩溃导致数据文件只剩一半内容。
+    '''
+    tmp_file = f"{file_path}.tmp"
+    if isinstance(content, bytes):
+        tmp = open(tmp_file, "wb")
+    else:
+        tmp = open(tmp_file, "w", encoding='utf-8')
+    with tmp as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, file_path)
+
+
+async def async_write_json_atomic(file_path: str, data):
+    '''在线程池中原子写入JSON文件，避免磁盘写入和 fsync 阻塞事件循环
+
+    序列化仍在事件循环线程中完成，保证写出的是调用时刻的数据快照；
+    写入过程串行执行，避免并发写同一个临时文件。
+    '''
+    content = json_dumps(data)
+    async with _file_write_lock:
+        await asyncio.get_running_loop().run_in_executor(None, write_text_atomic, file_path, content)
+
+
+def pack_reminder_data(reminder_data: dict) -> dict:
+    '''把每个会话的提醒列表转换为紧凑格式写入JSON文件
+
+    每个会话保存为 {"k": 字段名列表, "v": 每条提醒的字段值列表}，
+    字段名在每个会话中只出现一次，文件更小，加载时解析也更快。
+    字段名列表取自会话中的第一条提醒；字段与之不同的提醒（如旧版本缺少某些字段）
+    原样保存为字典，加载时不会多出值为 None 的字段。
+    '''
+    packed = {}
+    for session_id, reminders in reminder_data.items():
+        keys = list(reminders[0]) if reminders else []
+        key_set = set(keys)
+        packed[session_id] = {"k": keys, "v": [
+            [reminder[key] for key in keys] if reminder.keys() == key_set else reminder
+            for reminder in reminders
+        ]}
+    return packed
+
+
+def unpack_reminder_data(data: dict) -> dict:
+    '''将紧凑格式还原为提醒字典列表，旧格式（直接保存提醒字典列表）原样保留'''
+    result = {}
+    for session_id, reminders in data.items():
+        if isinstance(reminders, dict) and "k" in reminders and "v" in reminders:
+            keys = reminders["k"]
+            reminders = [dict(zip(keys, row)) if isinstance(row, list) else row for row in reminders["v"]]
+        for reminder in reminders:
+            # 同一用户的提醒共用一个 creator_id 字符串对象
+            creator_id = reminder.get("creator_id")
+            if isinstance(creator_id, str):
+                reminder["creator_id"] = sys.intern(creator_id)
+        result[session_id] = reminders
+    return result
+
+
+def write_reminder_file(data_file: str, content: bytes):
+    '''写入提醒数据文件
+
+    内容超过 GZIP_THRESHOLD 时压缩后写入 <数据文件>.gz，否则直接写入数据文件，
+    并删除另一种格式的旧文件，保证加载时只会读到最新的数据。
+    '''
+    gz_file = f"{data_file}.gz"
+    if len(content) > GZIP_THRESHOLD:
+        write_text_atomic(gz_file, gzip.compress(content, compresslevel=6))
+        stale_file = data_file
+    else:
+        write_text_atomic(data_file, content)
+        stale_file = gz_file
+    if os.path.exists(stale_file):
+        os.remove(stale_file)
+
+
 def load_reminder_data(data_file: str, postgres_url: str) -> dict:
     '''首次加载提醒数据：
 
@@ -186,48 +380,14 @@ def load_postgres_data(postgres_url):
     try:
         # 使用 DictCursor 以便通过列名访问数据
         with conn.cursor(cursor_factory=DictCursor) as cursor:
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reminders
-            (
-                id           SERIAL PRIMARY KEY,
-                session_id   TEXT      NOT NULL,
-                text         TEXT      NOT NULL,
-                date_time    TIMESTAMP NOT NULL,
-                user_name    TEXT,
-                repeat_type  TEXT,
-                holiday_type TEXT,
-                creator_id   TEXT,
-                creator_name TEXT,
-                is_task      BOOLEAN   DEFAULT FALSE,
-                created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            CREATE INDEX IF NOT EXISTS idx_session_id ON reminders (session_id);
-            CREATE INDEX IF NOT EXISTS idx_creator_id ON reminders (creator_id);
-                           """)
+            cursor.execute(CREATE_TABLES_SQL)
             # 执行查询
-            cursor.execute('SELECT * FROM reminders ORDER BY date_time')
+            cursor.execute(SELECT_REMINDERS_SQL)
             rows = cursor.fetchall()
 
+            # psycopg2 会自动把 json 类型解码为 Python 对象
             for row in rows:
-                session_id = row['session_id']
-
-                if session_id not in result:
-                    result[session_id] = []
-
-                # 将数据库记录转换为字典格式
-                reminder = {
-                    'id': row['id'],
-                    'text': row['text'],
-                    "date_time": row["date_time"].strftime("%Y-%m-%d %H:%M"),
-                    'user_name': row['user_name'],
-                    'repeat_type': row['repeat_type'],
-                    'holiday_type': row['holiday_type'],
-                    'creator_id': row['creator_id'],
-                    'creator_name': row['creator_name'],
-                    'is_task': row['is_task']
-                }
-
-                result[session_id].append(reminder)
+                result[row['session_id']] = row['reminders']
 
     finally:
         # 关闭连接
@@ -244,30 +404,40 @@ def load_json_data(data_file):
             os.makedirs(data_dir, exist_ok=True)
             logger.info(f"创建数据目录: {data_dir}")
 
-        # 如果文件不存在或为空，创建新的空数据文件
-        if not os.path.exists(data_file) or os.path.getsize(data_file) == 0:
+        # 数据较大时以 gzip 压缩格式保存。写入新格式后才会删除旧格式的文件，
+        # 中途崩溃时两个文件可能同时存在，此时读取最近写入的非空文件
+        gz_file = f"{data_file}.gz"
+        candidates = [file for file in (gz_file, data_file)
+                      if os.path.exists(file) and os.path.getsize(file) > 0]
+        read_file = max(candidates, key=lambda file: os.stat(file).st_mtime_ns) if candidates else data_file
+
+        # 两个文件都不存在或为空时，创建新的空数据文件
+        if not os.path.exists(read_file) or os.path.getsize(read_file) == 0:
             with open(data_file, "w", encoding='utf-8') as f:
                 json.dump({}, f, ensure_ascii=False, indent=2)
             return {}
 
         # 尝试读取并解析JSON数据
         try:
-            with open(data_file, "r", encoding='utf-8') as f:
-                content = f.read().strip()
-                if not content:  # 如果文件为空
-                    return {}
-                data = json.loads(content)
-                if not isinstance(data, dict):
-                    logger.error("提醒数据格式错误，重置为空字典")
-                    return {}
-                return data
-        except json.JSONDecodeError as e:
+            with open(read_file, "rb") as f:
+                content = f.read()
+            if read_file == gz_file:
+                content = gzip.decompress(content)
+            content = content.strip()
+            if not content:  # 如果文件为空
+                return {}
+            data = json_loads(content)
+            if not isinstance(data, dict):
+                logger.error("提醒数据格式错误，重置为空字典")
+                return {}
+            return unpack_reminder_data(data)
+        except (json.JSONDecodeError, UnicodeDecodeError, gzip.BadGzipFile, EOFError, zlib.error) as e:
             logger.error(f"JSON解析错误: {str(e)}，重置提醒数据")
             # 备份损坏的文件
-            if os.path.exists(data_file):
-                backup_file = f"{data_file}.bak"
+            if os.path.exists(read_file):
+                backup_file = f"{read_file}.bak"
                 try:
-                    os.rename(data_file, backup_file)
+                    os.rename(read_file, backup_file)
                     logger.info(f"已备份损坏的数据文件到: {backup_file}")
                 except Exception as e:
                     logger.error(f"备份数据文件失败: {str(e)}")
@@ -322,12 +492,65 @@ async def async_load_reminder_data(data_file: str, postgres_url: str) -> dict:
 
 async def async_save_reminder_data(data_file: str, postgres_url: str, reminder_data: dict) -> bool:
     '''保存提醒数据
+
+    等待 SAVE_DEBOUNCE_DELAY 秒后再写入，期间同一数据文件的其他保存请求共用这次写入，
+    连续多次修改只写入一次。返回值为实际写入的结果。
+    '''
+    task = _pending_saves.get(data_file)
+    if task is None:
+        task = asyncio.ensure_future(_debounced_save(data_file, postgres_url, reminder_data))
+        _pending_saves[data_file] = task
+    # shield 保证某个调用方被取消时，其他调用方共用的写入仍会完成
+    return await asyncio.shield(task)
+
+
+async def _debounced_save(data_file: str, postgres_url: str, reminder_data: dict) -> bool:
+    '''等待合并窗口结束后执行一次写入'''
+    await asyncio.sleep(SAVE_DEBOUNCE_DELAY)
+    # 写入开始后到达的保存请求需要另起一次写入，才能包含之后的修改
+    _pending_saves.pop(data_file, None)
+    async with _save_lock:
+        return await _write_reminder_data(data_file, postgres_url, reminder_data)
+
+
+async def flush_reminder_data():
+    '''等待所有尚未完成的保存请求写入完毕，插件卸载时调用'''
+    if _pending_saves:
+        await asyncio.gather(*_pending_saves.values(), return_exceptions=True)
+    # 等待正在进行的写入结束
+    async with _save_lock:
+        pass
+
+
+async def _write_reminder_data(data_file: str, postgres_url: str, reminder_data: dict) -> bool:
+    '''立即保存提醒数据
     
     - 如果设置了postgres_url，保存到PostgreSQL
     - 否则保存到本地JSON文件
     '''
     global postgres_manager
 
+    # 在保存前清理过期的一次性任务和无效数据（内存中的数据是唯一数据源，两种存储方式都需要清理）
+    for group in list(reminder_data.keys()):
+        # 只清理过期的一次性任务，兼容新旧结构
+        def is_one_time(r):
+            repeat_type = r.get("repeat_type")
+            # if not repeat_type and "repeat" in r:
+            #     repeat = r.get("repeat", "none")
+            #     if "_" in repeat:
+            #         repeat_type, _ = repeat.split("_", 1)
+            #     else:
+            #         repeat_type = repeat
+            return repeat_type in [None, "none", "不重复"]
+
+        reminder_data[group] = [
+            r for r in reminder_data[group]
+            if "date_time" in r and r["date_time"] and not (is_one_time(r) and is_outdated(r))
+        ]
+        # 如果群组没有任何提醒了，删除这个群组的条目
+        if not reminder_data[group]:
+            del reminder_data[group]
+
     if postgres_url is not None and postgres_url != "":
         try:
             # 如果postgres_manager未初始化，执行初始化
@@ -348,35 +571,15 @@ async def async_save_reminder_data(data_file: str, postgres_url: str, reminder_d
             os.makedirs(data_dir, exist_ok=True)
             logger.info(f"创建数据目录: {data_dir}")
 
-        # 在保存前清理过期的一次性任务和无效数据
-        for group in list(reminder_data.keys()):
-            # 只清理过期的一次性任务，兼容新旧结构
-            def is_one_time(r):
-                repeat_type = r.get("repeat_type")
-                # if not repeat_type and "repeat" in r:
-                #     repeat = r.get("repeat", "none")
-                #     if "_" in repeat:
-                #         repeat_type, _ = repeat.split("_", 1)
-                #     else:
-                #         repeat_type = repeat
-                return repeat_type in [None, "none", "不重复"]
-
-            reminder_data[group] = [
-                r for r in reminder_data[group]
-                if "date_time" in r and r["date_time"] and not (is_one_time(r) and is_outdated(r))
-            ]
-            # 如果群组没有任何提醒了，删除这个群组的条目
-            if not reminder_data[group]:
-                del reminder_data[group]
-
         # 确保数据是有效的字典格式
         if not isinstance(reminder_data, dict):
             logger.error("提醒数据格式错误，重置为空字典")
             reminder_data = {}
 
-        # 保存数据
-        with open(data_file, "w", encoding='utf-8') as f:
-            json.dump(reminder_data, f, ensure_ascii=False, indent=2)
+        # 以紧凑格式保存数据，数据较大时自动压缩；压缩和写入都在线程池中完成
+        content = json_dumps(pack_reminder_data(reminder_data))
+        async with _file_write_lock:
+            await asyncio.get_running_loop().run_in_executor(None, write_reminder_file, data_file, content)
 
         logger.info(f"成功保存提醒数据到: {data_file}")
         return True
@@ -386,6 +589,45 @@ async def async_save_reminder_data(data_file: str, postgres_url: str, reminder_d
         return False
 
 
+class CreatorIndex:
+    '''提醒数据的创建者索引
+
+    查找某个用户的提醒原本需要遍历全部会话键并逐个做 endswith 比较，
+    这里预先登记每个会话键中每个 "_" 之后的后缀，查找时只需一次字典访问。
+    '''
+
+    def __init__(self, reminder_data: dict = None):
+        # 后缀 -> 以 "_后缀" 结尾的会话键集合
+        self._keys = {}
+        # 会话键 -> 登记序号，用于让结果保持与 reminder_data 相同的顺序
+        self._order = {}
+        self._seq = 0
+        for key in reminder_data or ():
+            self.add(key)
+
+    def add(self, key: str):
+        '''登记一个新加入 reminder_data 的会话键'''
+        self._seq += 1
+        self._order[key] = self._seq
+        start = key.find("_")
+        while start != -1:
+            self._keys.setdefault(key[start + 1:], set()).add(key)
+            start = key.find("_", start + 1)
+
+    def keys_for(self, reminder_data: dict, creator_id, msg_origin: str) -> list:
+        '''返回以 "_{creator_id}" 结尾或等于 msg_origin 的会话键，顺序与 reminder_data 一致'''
+        creator_keys = self._keys.get(f"{creator_id}")
+        if not creator_keys:
+            # 索引中没有该用户的会话键时只需检查当前会话，无需构建集合和排序
+            return [msg_origin] if msg_origin in reminder_data else []
+        keys = set(creator_keys)
+        keys.add(msg_origin)
+        # 已被清空删除的会话键仍可能留在索引中，这里一并过滤
+        keys = [key for key in keys if key in reminder_data]
+        keys.sort(key=lambda key: self._order.get(key, self._seq + 1))
+        return keys
+
+
 # 法定节假日相关功能
 class HolidayManager:
     def __init__(self):
@@ -403,7 +645,7 @@ class HolidayManager:
 
         try:
             with open(self.holiday_cache_file, "r", encoding='utf-8') as f:
-                data = json.load(f)
+                data = json_loads(f.read())
 
             # 检查数据是否过期（缓存超过30天更新一次）
             if "last_update" in data:
@@ -424,8 +666,7 @@ class HolidayManager:
             # 添加最后更新时间
             self.holiday_data["last_update"] = datetime.datetime.now().isoformat()
 
-            with open(self.holiday_cache_file, "w", encoding='utf-8') as f:
-                json.dump(self.holiday_data, f, ensure_ascii=False)
+            await async_write_json_atomic(self.holiday_cache_file, self.holiday_data)
         except Exception as e:
             logger.error(f"保存节假日数据缓存失败: {e}")
 
@@ -491,8 +732,7 @@ class HolidayManager:
             date = datetime.datetime.now()
 
         year = date.year
-        # 获取完整日期和不含年份的日期
-        full_date_str = date.strftime("%Y-%m-%d")
+        # 节假日数据以不含年份的日期为键
         short_date_str = date.strftime("%m-%d")
 
         # 获取该年份的节假日数据
@@ -523,8 +763,7 @@ class HolidayManager:
             date = datetime.datetime.now()
 
         year = date.year
-        # 获取完整日期和不含年份的日期
-        full_date_str = date.strftime("%Y-%m-%d")
+        # 节假日数据以不含年份的日期为键
         short_date_str = date.strftime("%m-%d")
 
         # 获取该年份的节假日数据
@@ -18,7 +18,7 @@ from astrbot.core.star.star_handler import star_handlers_registry, EventType
 from .core.reminder import ReminderSystem
 from .core.scheduler import ReminderScheduler
 from .core.tools import ReminderTools
-from .core.utils import load_reminder_data
+from .core.utils import load_reminder_data, flush_reminder_data
 
 
 @register("astrbot_plugin_remind", "beat4ocean", "智能提醒、任务插件", "0.0.2")
@@ -77,7 +77,8 @@ class Main(Star):
             self.scheduler_manager,
             self.tools,
             self.data_file,
-            self.postgres_url
+            self.postgres_url,
+            self.reminder_data
         )
 
         # 记录配置信息
@@ -89,6 +90,10 @@ class Main(Star):
         self.last_usage = {}  # 存储每个用户上次使用指令的时间
         self.semaphore = asyncio.Semaphore(10)  # 限制并发请求数量为 10
 
+    async def terminate(self):
+        '''插件卸载或停用时，写入尚未保存的提醒数据'''
+        await flush_reminder_data()
+
     # ========== 命令行开始 ==========
     # 命令组必须定义在主类中
     @command_group("remind")
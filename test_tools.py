@@ -0,0 +1,85 @@
+import asyncio
+import types
+
+from core.scheduler import ReminderScheduler
+from core.tools import ReminderTools
+
+
+class FakeScheduler:
+    '''只记录任务ID的调度器，任务ID与 ReminderScheduler 的生成方式一致'''
+
+    make_job_id = staticmethod(ReminderScheduler.make_job_id)
+
+    def __init__(self):
+        self.jobs = set()
+
+    def add_job(self, msg_origin, reminder, dt):
+        self.jobs.add(self.make_job_id(msg_origin, reminder))
+        return True
+
+    def remove_job(self, job_id):
+        if job_id not in self.jobs:
+            return False
+        self.jobs.remove(job_id)
+        return True
+
+
+class FakeEvent:
+    unified_msg_origin = "aiocqhttp:GroupMessage:1"
+    session_id = "1"
+
+    def get_sender_id(self):
+        return "10001"
+
+    def get_sender(self):
+        return {"nickname": "测试用户"}
+
+    def plain_result(self, text):
+        return text
+
+
+def make_tools(tmp_path, reminder_data=None):
+    star = types.SimpleNamespace(
+        context=None,
+        reminder_data={} if reminder_data is None else reminder_data,
+        data_file=str(tmp_path / "remind_data.json"),
+        postgres_url="",
+        scheduler_manager=FakeScheduler(),
+        unique_session=False,
+        config={},
+    )
+    return ReminderTools(star)
+
+
+def test_duplicate_remind_is_rejected_and_delete_removes_its_job(tmp_path):
+    async def run():
+        tools = make_tools(tmp_path)
+        event = FakeEvent()
+        await tools.set_remind(event, "喝水", "2099-01-01 08:00")
+        assert await tools.set_remind(event, "喝水", "2099-01-01 08:00") == "已存在相同内容和时间的提醒，无需重复添加。"
+        assert len(tools.reminder_data[event.unified_msg_origin]) == 1
+        assert len(tools.scheduler_manager.jobs) == 1
+
+        assert await tools.delete_remind(event, "1") == "已删除提醒：喝水"
+        assert tools.reminder_data == {}
+        assert tools.scheduler_manager.jobs == set()
+
+    asyncio.run(run())
+
+
+def test_delete_one_of_legacy_duplicates_keeps_shared_job(tmp_path):
+    async def run():
+        event = FakeEvent()
+        reminder = {"text": "喝水", "date_time": "2099-01-01 08:00", "creator_id": "10001", "repeat_type": "none"}
+        tools = make_tools(tmp_path, {event.unified_msg_origin: [dict(reminder), dict(reminder)]})
+        # 两条相同的提醒共用一个定时任务
+        tools.scheduler_manager.add_job(event.unified_msg_origin, reminder, None)
+
+        await tools.delete_remind(event, "1")
+        assert tools.reminder_data == {event.unified_msg_origin: [reminder]}
+        assert tools.scheduler_manager.jobs == {ReminderScheduler.make_job_id(event.unified_msg_origin, reminder)}
+
+        await tools.delete_remind(event, "1")
+        assert tools.scheduler_manager.jobs == set()
+
+    asyncio.run(run())
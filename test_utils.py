@@ -0,0 +1,121 @@
+import gzip
+import json
+import os
+
+from core.utils import pack_reminder_data, unpack_reminder_data, CreatorIndex, load_json_data
+
+
+def round_trip(reminder_data):
+    # 与保存和加载时一样经过一次 JSON 序列化
+    return unpack_reminder_data(json.loads(json.dumps(pack_reminder_data(reminder_data), ensure_ascii=False)))
+
+
+def test_pack_round_trip_keeps_missing_keys_missing():
+    reminder_data = {
+        "session_a": [
+            {"text": "喝水", "date_time": "2025-01-01 08:00", "creator_id": "1"},
+            {"text": "开会", "date_time": "2025-01-01 09:00", "is_task": True},
+        ],
+        "session_b": [
+            {"text": "旧提醒", "date_time": "2025-01-02 10:00"},
+            {"text": "新提醒", "date_time": "2025-01-02 11:00", "creator_id": "2", "repeat_type": None},
+            {"text": "旧提醒2", "date_time": "2025-01-02 12:00"},
+        ],
+    }
+    loaded = round_trip(reminder_data)
+    assert loaded == reminder_data
+    assert "is_task" not in loaded["session_a"][0]
+    assert "creator_id" not in loaded["session_a"][1]
+    assert "creator_id" not in loaded["session_b"][0]
+    # 值为 None 的字段仍然保留
+    assert "repeat_type" in loaded["session_b"][1]
+
+
+def test_pack_round_trip_uniform_and_empty_sessions():
+    reminder_data = {
+        "session_a": [
+            {"text": "喝水", "date_time": "2025-01-01 08:00", "creator_id": "1", "is_task": False},
+            {"is_task": True, "creator_id": "1", "date_time": "2025-01-01 09:00", "text": "开会"},
+        ],
+        "session_b": [],
+    }
+    packed = pack_reminder_data(reminder_data)
+    # 字段相同的提醒（与字段顺序无关）都以值列表保存
+    assert all(isinstance(row, list) for row in packed["session_a"]["v"])
+    assert round_trip(reminder_data) == reminder_data
+
+
+def test_unpack_legacy_format():
+    legacy = {"session_a": [{"text": "喝水", "date_time": "2025-01-01 08:00", "creator_id": "1"}]}
+    assert unpack_reminder_data(json.loads(json.dumps(legacy))) == legacy
+
+
+def test_creator_index_keys_for_creator_id_with_underscore():
+    reminder_data = {
+        "aiocqhttp:GroupMessage:1_user_a": [],
+        "aiocqhttp:GroupMessage:2_a": [],
+        "aiocqhttp:PrivateMessage:3": [],
+    }
+    index = CreatorIndex(reminder_data)
+    assert index.keys_for(reminder_data, "user_a", "other") == ["aiocqhttp:GroupMessage:1_user_a"]
+    # 与 endswith("_a") 的结果一致
+    assert index.keys_for(reminder_data, "a", "other") == [
+        "aiocqhttp:GroupMessage:1_user_a",
+        "aiocqhttp:GroupMessage:2_a",
+    ]
+
+
+def test_creator_index_keys_for_keeps_reminder_data_order():
+    reminder_data = {"s3_u": [], "s1_u": [], "current": []}
+    index = CreatorIndex(reminder_data)
+    reminder_data["s2_u"] = []
+    index.add("s2_u")
+    assert index.keys_for(reminder_data, "u", "current") == ["s3_u", "s1_u", "current", "s2_u"]
+    # 当前会话与用户的会话键相同时只返回一次
+    assert index.keys_for(reminder_data, "u", "s1_u") == ["s3_u", "s1_u", "s2_u"]
+
+
+def test_creator_index_keys_for_skips_pruned_keys():
+    reminder_data = {"s1_u": [], "s2_u": [], "current": []}
+    index = CreatorIndex(reminder_data)
+    del reminder_data["s1_u"]
+    assert index.keys_for(reminder_data, "u", "current") == ["s2_u", "current"]
+    del reminder_data["current"]
+    assert index.keys_for(reminder_data, "u", "current") == ["s2_u"]
+    # 没有该用户的会话键时只检查当前会话
+    assert index.keys_for(reminder_data, "nobody", "s2_u") == ["s2_u"]
+    assert index.keys_for(reminder_data, "nobody", "current") == []
+
+
+def test_load_json_data_ignores_empty_gzip_file(tmp_path):
+    data_file = tmp_path / "remind_data.json"
+    reminder_data = {"session_a": [{"text": "喝水", "date_time": "2025-01-01 08:00"}]}
+    data_file.write_text(json.dumps(pack_reminder_data(reminder_data)), encoding="utf-8")
+    (tmp_path / "remind_data.json.gz").write_bytes(b"")
+    assert load_json_data(str(data_file)) == reminder_data
+    # 普通数据文件不会被空数据覆盖
+    assert json.loads(data_file.read_text(encoding="utf-8")) == pack_reminder_data(reminder_data)
+
+
+def test_load_json_data_creates_empty_file_when_missing(tmp_path):
+    data_file = tmp_path / "remind_data.json"
+    assert load_json_data(str(data_file)) == {}
+    assert json.loads(data_file.read_text(encoding="utf-8")) == {}
+
+
+def test_load_json_data_prefers_newest_file(tmp_path):
+    data_file = tmp_path / "remind_data.json"
+    gz_file = tmp_path / "remind_data.json.gz"
+    old_data = {"session_a": [{"text": "旧提醒", "date_time": "2025-01-01 08:00"}]}
+    new_data = {"session_a": [{"text": "新提醒", "date_time": "2025-01-01 09:00"}]}
+
+    # 从压缩格式切换为普通格式时，写入普通文件后、删除压缩文件前崩溃
+    gz_file.write_bytes(gzip.compress(json.dumps(pack_reminder_data(old_data)).encode()))
+    data_file.write_text(json.dumps(pack_reminder_data(new_data)), encoding="utf-8")
+    os.utime(gz_file, ns=(1_000_000_000, 1_000_000_000))
+    os.utime(data_file, ns=(2_000_000_000, 2_000_000_000))
+    assert load_json_data(str(data_file)) == new_data
+
+    # 反方向切换时同样读取较新的压缩文件
+    os.utime(gz_file, ns=(3_000_000_000, 3_000_000_000))
+    assert load_json_data(str(data_file)) == old_data